@@ -14,20 +14,33 @@ Boot behavior mirrors other Hydra services:
 from __future__ import annotations
 
 import base64
+import contextlib
+import copy
+import gzip
+import hashlib
+import http.cookiejar
+import heapq
+import hmac
 import ipaddress
+import itertools
 import json
 import os
 import platform
 import random
+import re
+import secrets
 import shutil
+import struct
 import subprocess
 import sys
 import threading
 import time
 import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from queue import Empty, Queue
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 # ──────────────────────────────────────────────────────────────
 # 0) Embedded venv bootstrap (same pattern as other services)
@@ -73,26 +86,36 @@ SCRIPT_PATH = Path(__file__).resolve()
 SCRIPT_DIR = SCRIPT_PATH.parent
 SETUP_MARKER = SCRIPT_DIR / ".scrape_setup_complete"
 OUT_DIR = SCRIPT_DIR / "frames"
-
-
-def _pip_install(*pkgs: str) -> None:
-    subprocess.check_call([sys.executable, "-m", "pip", "install", *pkgs])
+REQUIREMENTS_LOCK = SCRIPT_DIR / "requirements.lock"
+PINNED_REQUIREMENTS = (
+    "Flask==3.0.3",
+    "Flask-Cors==4.0.1",
+    "python-dotenv==1.0.1",
+    "requests==2.32.3",
+    "beautifulsoup4==4.12.3",
+    "lxml==5.3.0",
+    "selenium==4.27.1",
+    "webdriver-manager==4.0.2",
+    "orjson==3.10.12",
+    "waitress==3.0.2",
+)
+
+
+def _pip_install(*args: str) -> None:
+    env = os.environ.copy()
+    env.setdefault("PIP_CACHE_DIR", str(VENV_DIR / "pip-cache"))
+    subprocess.check_call([sys.executable, "-m", "pip", "install", *args], env=env)
 
 
 if not SETUP_MARKER.exists():
-    _pip_install(
-        "--upgrade",
-        "pip",
-        "Flask",
-        "Flask-Cors",
-        "python-dotenv",
-        "requests",
-        "beautifulsoup4",
-        "lxml",
-        "selenium",
-        "webdriver-manager",
-        "pillow",
-    )
+    if not REQUIREMENTS_LOCK.exists():
+        REQUIREMENTS_LOCK.write_text("\n".join(PINNED_REQUIREMENTS) + "\n", encoding="utf-8")
+    _pip_install("--upgrade", "pip")
+    # Wheels only: building lxml from source takes minutes on small ARM boards.
+    binary_args = ["--prefer-binary"]
+    if os.getenv("SCRAPE_PIP_ALLOW_SDIST", "0").strip().lower() not in ("1", "true", "yes", "on"):
+        binary_args.append("--only-binary=:all:")
+    _pip_install(*binary_args, "--no-compile", "-r", str(REQUIREMENTS_LOCK))
     env_path = SCRIPT_DIR / ".env"
     if not env_path.exists():
         env_path.write_text(
@@ -109,7 +132,12 @@ if not SETUP_MARKER.exists():
             "SCRAPE_RATE_LIMIT_WHITELIST=\n"
             "SCRAPE_FILE_TTL_S=900\n"
             "SCRAPE_FRAME_KEEPALIVE_S=45\n"
-            "SCRAPE_HEADLESS_DEFAULT=1\n".format(key=uuid.uuid4().hex),
+            "SCRAPE_HEADLESS_DEFAULT=1\n"
+            "SCRAPE_MAX_USES_PER_INSTANCE=1\n"
+            "SCRAPE_SSE_COALESCE_MS=15\n"
+            "SCRAPE_XACCEL_PREFIX=\n"
+            "SCRAPE_HTTP_THREADS=16\n"
+            "SCRAPE_MAX_SSE_STREAMS=16\n".format(key=uuid.uuid4().hex),
             encoding="utf-8",
         )
     OUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -119,19 +147,23 @@ if not SETUP_MARKER.exists():
 # ──────────────────────────────────────────────────────────────
 # 2) Runtime imports (after env ready)
 # ──────────────────────────────────────────────────────────────
-from flask import Flask, Response, jsonify, request, send_from_directory, g  # noqa: E402
+from flask import Flask, Response, request, send_from_directory, g  # noqa: E402
 from flask_cors import CORS  # noqa: E402
+from werkzeug.exceptions import HTTPException  # noqa: E402
 from dotenv import load_dotenv  # noqa: E402
-from PIL import Image  # noqa: E402
+import requests  # noqa: E402
+from requests.adapters import HTTPAdapter  # noqa: E402
 from selenium import webdriver  # noqa: E402
 from selenium.common.exceptions import TimeoutException, WebDriverException  # noqa: E402
 from selenium.webdriver.common.by import By  # noqa: E402
-from selenium.webdriver.common.keys import Keys  # noqa: E402
 from selenium.webdriver.chrome.options import Options  # noqa: E402
 from selenium.webdriver.chrome.service import Service  # noqa: E402
-from selenium.webdriver.support import expected_conditions as EC  # noqa: E402
-from selenium.webdriver.support.ui import WebDriverWait  # noqa: E402
 from webdriver_manager.chrome import ChromeDriverManager  # noqa: E402
+
+try:
+    import orjson  # noqa: E402
+except ImportError:  # installs bootstrapped before orjson was added
+    orjson = None
 from selenium.webdriver.common.action_chains import ActionChains  # noqa: E402
 
 
@@ -140,11 +172,67 @@ def log_message(msg: str, level: str = "INFO") -> None:
     print(f"[{ts}] [{level.upper()}] {msg}")
 
 
+CHROMEDRIVER_CACHE = SCRIPT_DIR / ".chromedriver_cache"
+_PROBE_LOCK = threading.Lock()
+
+
+def _read_probe_cache() -> dict:
+    try:
+        cache = json.loads(CHROMEDRIVER_CACHE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _cached_probe(kind: str) -> Optional[dict]:
+    """Cached ``kind`` entry, provided its binary still exists with the recorded mtime."""
+    with _PROBE_LOCK:
+        entry = _read_probe_cache().get(kind)
+    if not isinstance(entry, dict):
+        return None
+    try:
+        if os.stat(entry.get("path") or "").st_mtime != entry.get("mtime"):
+            return None
+    except OSError:
+        return None
+    return entry
+
+
+def _probe_version(kind: str, path: str) -> Optional[str]:
+    """Output of ``path --version``, cached across restarts until the binary changes."""
+    entry = _cached_probe(kind)
+    if entry and entry.get("path") == path:
+        return entry.get("version")
+    try:
+        mtime = os.stat(path).st_mtime
+        out = subprocess.run([path, "--version"], check=True, capture_output=True, timeout=15)
+    except Exception:
+        return None
+    version = out.stdout.decode("utf-8", "replace").strip()
+    with _PROBE_LOCK:
+        cache = _read_probe_cache()
+        cache[kind] = {"path": path, "mtime": mtime, "version": version}
+        with contextlib.suppress(OSError):
+            CHROMEDRIVER_CACHE.write_text(json.dumps(cache), encoding="utf-8")
+    return version
+
+
+def _version_number(raw: str) -> str:
+    match = re.search(r"\d+(?:\.\d+)+", raw or "")
+    if not match:
+        raise ValueError(f"no version in {raw!r}")
+    return match.group(0)
+
+
 class Tools:
-    _driver: Optional[webdriver.Chrome] = None
+    _opts_template: Optional[Options] = None
+    _opts_lock = threading.Lock()
 
     @staticmethod
     def _find_system_chromedriver() -> Optional[str]:
+        cached = _cached_probe("chromedriver")
+        if cached and os.access(cached["path"], os.X_OK):
+            return cached["path"]
         candidates = [
             shutil.which("chromedriver"),
             "/usr/bin/chromedriver",
@@ -154,122 +242,134 @@ class Tools:
             "/opt/homebrew/bin/chromedriver",
         ]
         for path in filter(None, candidates):
-            if os.path.isfile(path) and os.access(path, os.X_OK):
-                try:
-                    subprocess.run([path, "--version"], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                    return path
-                except Exception:
-                    continue
+            if os.path.isfile(path) and os.access(path, os.X_OK) and _probe_version("chromedriver", path) is not None:
+                return path
         return None
 
     @staticmethod
-    def open_browser(headless: bool = False, force_new: bool = False) -> str:
-        if force_new and Tools._driver:
-            try:
-                Tools._driver.quit()
-            except Exception:
-                pass
-            Tools._driver = None
-
-        if Tools._driver:
-            return "Browser already open"
-
-        chrome_bin = (
-            os.getenv("CHROME_BIN")
-            or shutil.which("google-chrome")
-            or shutil.which("chromium-browser")
-            or shutil.which("chromium")
-            or "/snap/bin/chromium"
-            or "/usr/bin/chromium-browser"
-            or "/usr/bin/chromium"
-        )
+    def launch_driver(headless: bool = False) -> Tuple[webdriver.Chrome, str]:
+        drv, msg = Tools._start_driver(headless)
+        Tools._widen_connection_pool(drv)
+        return drv, msg
+
+    @staticmethod
+    def _widen_connection_pool(drv: webdriver.Chrome) -> None:
+        # Selenium talks to chromedriver through a urllib3 PoolManager that keeps one
+        # connection per host; concurrent calls on one driver would otherwise churn sockets.
+        conn = getattr(getattr(drv, "command_executor", None), "_conn", None)
+        pool_kw = getattr(conn, "connection_pool_kw", None)
+        if not isinstance(pool_kw, dict):
+            return
+        pool_kw["maxsize"] = MAX_CONCURRENCY * 2
+        with contextlib.suppress(Exception):
+            conn.clear()
 
-        opts = Options()
-        if chrome_bin:
-            opts.binary_location = chrome_bin
+    @staticmethod
+    def _base_options() -> Options:
+        # Built on first launch rather than at import so CHROME_BIN from .env is honoured.
+        with Tools._opts_lock:
+            if Tools._opts_template is None:
+                chrome_bin = (
+                    os.getenv("CHROME_BIN")
+                    or shutil.which("google-chrome")
+                    or shutil.which("chromium-browser")
+                    or shutil.which("chromium")
+                    or "/snap/bin/chromium"
+                    or "/usr/bin/chromium-browser"
+                    or "/usr/bin/chromium"
+                )
+                opts = Options()
+                if chrome_bin:
+                    opts.binary_location = chrome_bin
+                opts.add_argument("--window-size=1920,1080")
+                opts.add_argument("--disable-gpu")
+                opts.add_argument("--no-sandbox")
+                opts.add_argument("--disable-dev-shm-usage")
+                opts.add_argument("--remote-allow-origins=*")
+                Tools._opts_template = opts
+            return Tools._opts_template
+
+    @staticmethod
+    def _start_driver(headless: bool) -> Tuple[webdriver.Chrome, str]:
+        # Deep copy: a shallow copy would share the template's argument list.
+        opts = copy.deepcopy(Tools._base_options())
+        chrome_bin = opts.binary_location
         if headless:
             opts.add_argument("--headless=new")
-        opts.add_argument("--window-size=1920,1080")
-        opts.add_argument("--disable-gpu")
-        opts.add_argument("--no-sandbox")
-        opts.add_argument("--disable-dev-shm-usage")
-        opts.add_argument("--remote-allow-origins=*")
         opts.add_argument(f"--remote-debugging-port={random.randint(45000, 65000)}")
 
         try:
-            log_message("[open_browser] Trying Selenium-Manager…", "DEBUG")
-            Tools._driver = webdriver.Chrome(options=opts)
-            log_message("[open_browser] Launched via Selenium-Manager.", "SUCCESS")
-            return "Browser launched (selenium-manager)"
+            log_message("[launch_driver] Trying Selenium-Manager…", "DEBUG")
+            drv = webdriver.Chrome(options=opts)
+            log_message("[launch_driver] Launched via Selenium-Manager.", "SUCCESS")
+            return drv, "Browser launched (selenium-manager)"
         except WebDriverException as e:
-            log_message(f"[open_browser] Selenium-Manager failed: {e}", "WARNING")
+            log_message(f"[launch_driver] Selenium-Manager failed: {e}", "WARNING")
 
         snap_drv = "/snap/chromium/current/usr/lib/chromium-browser/chromedriver"
         if os.path.exists(snap_drv):
             try:
-                log_message(f"[open_browser] Using snap chromedriver at {snap_drv}", "DEBUG")
-                Tools._driver = webdriver.Chrome(service=Service(snap_drv), options=opts)
-                log_message("[open_browser] Launched via snap chromedriver.", "SUCCESS")
-                return "Browser launched (snap chromedriver)"
+                log_message(f"[launch_driver] Using snap chromedriver at {snap_drv}", "DEBUG")
+                drv = webdriver.Chrome(service=Service(snap_drv), options=opts)
+                log_message("[launch_driver] Launched via snap chromedriver.", "SUCCESS")
+                return drv, "Browser launched (snap chromedriver)"
             except WebDriverException as e:
-                log_message(f"[open_browser] Snap chromedriver failed: {e}", "WARNING")
+                log_message(f"[launch_driver] Snap chromedriver failed: {e}", "WARNING")
 
         sys_drv = Tools._find_system_chromedriver()
         if sys_drv:
             try:
-                log_message(f"[open_browser] Trying system chromedriver at {sys_drv}", "DEBUG")
-                Tools._driver = webdriver.Chrome(service=Service(sys_drv), options=opts)
-                log_message("[open_browser] Launched via system chromedriver.", "SUCCESS")
-                return "Browser launched (system chromedriver)"
+                log_message(f"[launch_driver] Trying system chromedriver at {sys_drv}", "DEBUG")
+                drv = webdriver.Chrome(service=Service(sys_drv), options=opts)
+                log_message("[launch_driver] Launched via system chromedriver.", "SUCCESS")
+                return drv, "Browser launched (system chromedriver)"
             except WebDriverException as e:
-                log_message(f"[open_browser] System chromedriver failed: {e}", "WARNING")
+                log_message(f"[launch_driver] System chromedriver failed: {e}", "WARNING")
 
         arch = (platform.machine() or "").lower()
         if arch in ("aarch64", "arm64", "armv8l", "armv7l") and chrome_bin:
             try:
-                raw = subprocess.check_output([chrome_bin, "--version"]).decode().strip()
-                ver = raw.split()[1]
+                ver = _version_number(_probe_version("chrome", chrome_bin) or "")
                 url = (
                     f"https://edgedl.me.gvt1.com/edgedl/chrome/chrome-for-testing/"
                     f"{ver}/linux-arm64/chromedriver-linux-arm64.zip"
                 )
                 tmp_zip = "/tmp/chromedriver_arm64.zip"
-                log_message(f"[open_browser] Downloading ARM64 driver from {url}", "DEBUG")
+                log_message(f"[launch_driver] Downloading ARM64 driver from {url}", "DEBUG")
                 subprocess.check_call(["wget", "-qO", tmp_zip, url])
                 subprocess.check_call(["unzip", "-o", tmp_zip, "-d", "/tmp"])
                 subprocess.check_call(["sudo", "mv", "/tmp/chromedriver", "/usr/local/bin/chromedriver"])
                 subprocess.check_call(["sudo", "chmod", "+x", "/usr/local/bin/chromedriver"])
-                drv = shutil.which("chromedriver")
-                log_message(f"[open_browser] Installed ARM64 driver at {drv}", "DEBUG")
-                Tools._driver = webdriver.Chrome(service=Service(drv), options=opts)
-                log_message("[open_browser] Launched via downloaded ARM64 chromedriver.", "SUCCESS")
-                return "Browser launched (downloaded ARM64 chromedriver)"
+                drv_path = shutil.which("chromedriver")
+                log_message(f"[launch_driver] Installed ARM64 driver at {drv_path}", "DEBUG")
+                drv = webdriver.Chrome(service=Service(drv_path), options=opts)
+                log_message("[launch_driver] Launched via downloaded ARM64 chromedriver.", "SUCCESS")
+                return drv, "Browser launched (downloaded ARM64 chromedriver)"
             except Exception as e:
-                log_message(f"[open_browser] ARM64 download/install failed: {e}", "WARNING")
+                log_message(f"[launch_driver] ARM64 download/install failed: {e}", "WARNING")
 
         if arch in ("x86_64", "amd64") and chrome_bin:
             try:
-                raw = subprocess.check_output([chrome_bin, "--version"]).decode().strip()
-                browser_major = raw.split()[1].split(".")[0]
+                browser_major = _version_number(_probe_version("chrome", chrome_bin) or "").split(".")[0]
             except Exception:
                 browser_major = "latest"
             try:
-                log_message(f"[open_browser] Installing ChromeDriver {browser_major} via webdriver-manager", "DEBUG")
+                log_message(f"[launch_driver] Installing ChromeDriver {browser_major} via webdriver-manager", "DEBUG")
                 drv_path = ChromeDriverManager(driver_version=browser_major).install()
-                Tools._driver = webdriver.Chrome(service=Service(drv_path), options=opts)
-                log_message("[open_browser] Launched via webdriver-manager.", "SUCCESS")
-                return "Browser launched (webdriver-manager)"
+                drv = webdriver.Chrome(service=Service(drv_path), options=opts)
+                log_message("[launch_driver] Launched via webdriver-manager.", "SUCCESS")
+                return drv, "Browser launched (webdriver-manager)"
             except Exception as e:
-                log_message(f"[open_browser] webdriver-manager failed: {e}", "ERROR")
+                log_message(f"[launch_driver] webdriver-manager failed: {e}", "ERROR")
 
         try:
-            log_message("[open_browser] Attempting `sudo snap install chromium`…", "DEBUG")
+            log_message("[launch_driver] Attempting `sudo snap install chromium`…", "DEBUG")
             subprocess.check_call(["sudo", "snap", "install", "chromium"])
-            Tools._driver = webdriver.Chrome(service=Service(snap_drv), options=opts)
-            log_message("[open_browser] Launched via newly-installed snap chromium.", "SUCCESS")
-            return "Browser launched (snap install fallback)"
+            drv = webdriver.Chrome(service=Service(snap_drv), options=opts)
+            log_message("[launch_driver] Launched via newly-installed snap chromium.", "SUCCESS")
+            return drv, "Browser launched (snap install fallback)"
         except Exception as e:
-            log_message(f"[open_browser] Auto-snap install failed or Chrome still not found: {e}", "ERROR")
+            log_message(f"[launch_driver] Auto-snap install failed or Chrome still not found: {e}", "ERROR")
 
         raise RuntimeError(
             "No usable Chrome/Chromium driver. Install Chrome and a matching chromedriver, "
@@ -277,55 +377,145 @@ class Tools:
         )
 
     @staticmethod
-    def close_browser() -> str:
-        if Tools._driver:
-            try:
-                Tools._driver.quit()
-                log_message("[close_browser] Browser closed.", "DEBUG")
-            except Exception:
-                pass
-            Tools._driver = None
-            return "Browser closed"
-        return "No browser to close"
-
-    @staticmethod
-    def is_browser_open() -> bool:
-        return Tools._driver is not None
+    def quit_driver(drv: Optional[webdriver.Chrome]) -> None:
+        if drv is None:
+            return
+        try:
+            drv.quit()
+            log_message("[quit_driver] Browser closed.", "DEBUG")
+        except Exception:
+            pass
 
     @staticmethod
-    def navigate(url: str) -> str:
-        if not Tools._driver:
+    def navigate(drv: Optional[webdriver.Chrome], url: str) -> str:
+        if not drv:
             return "Error: browser not open"
         log_message(f"[navigate] → {url}", "DEBUG")
-        Tools._driver.get(url)
+        drv.get(url)
         return f"Navigated to {url}"
 
     @staticmethod
-    def click(selector: str, timeout: int = 8) -> str:
-        if not Tools._driver:
+    def click(drv: Optional[webdriver.Chrome], selector: str, timeout: int = 8) -> str:
+        if not drv:
             return "Error: browser not open"
         try:
-            drv = Tools._driver
-            el = WebDriverWait(drv, timeout).until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
-            drv.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
-            el.click()
-            focused = drv.execute_script("return document.activeElement === arguments[0];", el)
-            log_message(f"[click] {selector} clicked (focused={focused})", "DEBUG")
+            # Wait, scroll, click and focus check in a single driver round-trip.
+            script = """
+                const selector = arguments[0];
+                const deadline = Date.now() + arguments[1];
+                const done = arguments[arguments.length - 1];
+                let delay = 25;
+                const ready = (el) => {
+                    if (!el || el.disabled) return false;
+                    const rect = el.getBoundingClientRect();
+                    if (rect.width === 0 && rect.height === 0) return false;
+                    const style = window.getComputedStyle(el);
+                    return style.visibility !== 'hidden' && style.display !== 'none';
+                };
+                const attempt = () => {
+                    let el;
+                    try { el = document.querySelector(selector); }
+                    catch (err) { done({ ok: false, reason: 'invalid selector' }); return; }
+                    if (ready(el)) {
+                        try {
+                            el.scrollIntoView({ block: 'center' });
+                            el.click();
+                            done({ ok: true, focused: document.activeElement === el, tag: el.tagName || '' });
+                        } catch (err) {
+                            done({ ok: false, reason: err && err.message ? err.message : String(err) });
+                        }
+                        return;
+                    }
+                    if (Date.now() >= deadline) {
+                        done({ ok: false, reason: el ? 'element not clickable' : 'element not found' });
+                        return;
+                    }
+                    setTimeout(attempt, delay);
+                    delay = Math.min(delay * 2, 250);
+                };
+                attempt();
+            """
+            res = drv.execute_async_script(script, selector, int(timeout * 1000))
+            if not isinstance(res, dict) or not res.get("ok"):
+                reason = res.get("reason") if isinstance(res, dict) else "unknown"
+                log_message(f"[click] Error clicking {selector}: {reason}", "ERROR")
+                return f"Error clicking {selector}: {reason}"
+            log_message(f"[click] {selector} clicked (focused={res.get('focused')})", "DEBUG")
             return f"Clicked {selector}"
         except Exception as e:
             log_message(f"[click] Error clicking {selector}: {e}", "ERROR")
             return f"Error clicking {selector}: {e}"
 
     @staticmethod
-    def input(selector: str, text: str, timeout: int = 8) -> str:
-        if not Tools._driver:
+    def input(drv: Optional[webdriver.Chrome], selector: str, text: str, timeout: int = 8) -> str:
+        if not drv:
             return "Error: browser not open"
         try:
-            drv = Tools._driver
-            el = WebDriverWait(drv, timeout).until(EC.element_to_be_clickable((By.CSS_SELECTOR, selector)))
-            drv.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
-            el.clear()
-            el.send_keys(text + Keys.RETURN)
+            # Wait, scroll, replace value, fire input/change and submit in a single round-trip.
+            script = """
+                const selector = arguments[0];
+                const text = arguments[1];
+                const deadline = Date.now() + arguments[2];
+                const done = arguments[arguments.length - 1];
+                let delay = 25;
+                const ready = (el) => {
+                    if (!el || el.disabled || el.readOnly) return false;
+                    const rect = el.getBoundingClientRect();
+                    return rect.width > 0 || rect.height > 0;
+                };
+                const setValue = (el, next) => {
+                    if (el.isContentEditable) {
+                        el.textContent = next;
+                        return;
+                    }
+                    const proto = Object.getPrototypeOf(el);
+                    const descriptor = proto && Object.getOwnPropertyDescriptor(proto, 'value');
+                    if (descriptor && descriptor.set) descriptor.set.call(el, next);
+                    else el.value = next;
+                };
+                const attempt = () => {
+                    let el;
+                    try { el = document.querySelector(selector); }
+                    catch (err) { done({ ok: false, reason: 'invalid selector' }); return; }
+                    if (ready(el)) {
+                        try {
+                            el.scrollIntoView({ block: 'center' });
+                            if (typeof el.focus === 'function') el.focus();
+                            // Return only submits from a single-line input; elsewhere it is a newline.
+                            const isInput = el.tagName === 'INPUT';
+                            setValue(el, isInput ? text : text + '\\n');
+                            const init = { bubbles: true, cancelable: true };
+                            el.dispatchEvent(new Event('input', init));
+                            el.dispatchEvent(new Event('change', init));
+                            if (isInput) {
+                                const enter = { key: 'Enter', code: 'Enter', keyCode: 13, bubbles: true, cancelable: true };
+                                const proceed = el.dispatchEvent(new KeyboardEvent('keydown', enter));
+                                el.dispatchEvent(new KeyboardEvent('keyup', enter));
+                                if (proceed && el.form) {
+                                    if (typeof el.form.requestSubmit === 'function') el.form.requestSubmit();
+                                    else el.form.submit();
+                                }
+                            }
+                            done({ ok: true, tag: el.tagName || '' });
+                        } catch (err) {
+                            done({ ok: false, reason: err && err.message ? err.message : String(err) });
+                        }
+                        return;
+                    }
+                    if (Date.now() >= deadline) {
+                        done({ ok: false, reason: el ? 'element not editable' : 'element not found' });
+                        return;
+                    }
+                    setTimeout(attempt, delay);
+                    delay = Math.min(delay * 2, 250);
+                };
+                attempt();
+            """
+            res = drv.execute_async_script(script, selector, text, int(timeout * 1000))
+            if not isinstance(res, dict) or not res.get("ok"):
+                reason = res.get("reason") if isinstance(res, dict) else "unknown"
+                log_message(f"[input] Error typing into {selector}: {reason}", "ERROR")
+                return f"Error typing into {selector}: {reason}"
             log_message(f"[input] Sent {text!r} to {selector}", "DEBUG")
             return f"Sent {text!r} to {selector}"
         except Exception as e:
@@ -333,42 +523,52 @@ class Tools:
             return f"Error typing into {selector}: {e}"
 
     @staticmethod
-    def get_dom_snapshot(max_chars: int = 200_000) -> str:
-        if not Tools._driver:
+    def get_dom_snapshot(drv: Optional[webdriver.Chrome], max_bytes: int = 200_000) -> str:
+        if not drv:
             return ""
         try:
-            dom = Tools._driver.execute_script("return document.documentElement.outerHTML;")
-            if dom and len(dom) > max_chars:
-                dom = dom[:max_chars]
-            return dom or ""
+            res = drv.execute_cdp_cmd(
+                "Runtime.evaluate",
+                {"expression": "document.documentElement.outerHTML", "returnByValue": True},
+            )
+            dom = ((res or {}).get("result") or {}).get("value") or ""
+            raw = dom.encode("utf-8")
+            if len(raw) > max_bytes:
+                # Back off only when the limit lands inside a tag, so consumers never see half
+                # a tag; a cut inside text stays at max_bytes ("ignore" drops a split character).
+                cut = max_bytes
+                lt = raw.rfind(b"<", 0, max_bytes)
+                if lt > raw.rfind(b">", 0, max_bytes):
+                    cut = lt
+                dom = raw[:cut].decode("utf-8", "ignore")
+            return dom
         except Exception as exc:
             log_message(f"[dom] snapshot failed: {exc}", "WARNING")
             return ""
 
     @staticmethod
-    def scroll(amount: int = 600) -> str:
-        if not Tools._driver:
+    def scroll(drv: Optional[webdriver.Chrome], amount: int = 600) -> str:
+        if not drv:
             return "Error: browser not open"
         try:
-            Tools._driver.execute_script("window.scrollBy(0, arguments[0]);", amount)
+            drv.execute_script("window.scrollBy(0, arguments[0]);", amount)
             return f"Scrolled by {amount}"
         except Exception as exc:
             log_message(f"[scroll] failed: {exc}", "WARNING")
             return f"Error scrolling: {exc}"
 
     @staticmethod
-    def screenshot(filename: str = "screenshot.png") -> str:
-        if not Tools._driver:
-            return "Error: browser not open"
-        Tools._driver.save_screenshot(filename)
-        return filename
+    def screenshot(drv: Optional[webdriver.Chrome]) -> bytes:
+        if not drv:
+            return b""
+        return drv.get_screenshot_as_png()
 
     @staticmethod
-    def go_back() -> str:
-        if not Tools._driver:
+    def go_back(drv: Optional[webdriver.Chrome]) -> str:
+        if not drv:
             return "Error: browser not open"
         try:
-            Tools._driver.back()
+            drv.back()
             log_message("[history] Navigated back", "DEBUG")
             return "Navigated back"
         except Exception as exc:
@@ -376,11 +576,11 @@ class Tools:
             return f"Error navigating back: {exc}"
 
     @staticmethod
-    def go_forward() -> str:
-        if not Tools._driver:
+    def go_forward(drv: Optional[webdriver.Chrome]) -> str:
+        if not drv:
             return "Error: browser not open"
         try:
-            Tools._driver.forward()
+            drv.forward()
             log_message("[history] Navigated forward", "DEBUG")
             return "Navigated forward"
         except Exception as exc:
@@ -388,11 +588,10 @@ class Tools:
             return f"Error navigating forward: {exc}"
 
     @staticmethod
-    def drag(start_x: float, start_y: float, end_x: float, end_y: float) -> str:
-        if not Tools._driver:
+    def drag(drv: Optional[webdriver.Chrome], start_x: float, start_y: float, end_x: float, end_y: float) -> str:
+        if not drv:
             return "Error: browser not open"
         try:
-            drv = Tools._driver
             body = drv.find_element(By.TAG_NAME, "body")
             sx = int(round(start_x))
             sy = int(round(start_y))
@@ -412,8 +611,8 @@ class Tools:
             return f"Error dragging: {exc}"
 
     @staticmethod
-    def scroll_point(x: float, y: float, delta_x: float, delta_y: float) -> str:
-        if not Tools._driver:
+    def scroll_point(drv: Optional[webdriver.Chrome], x: float, y: float, delta_x: float, delta_y: float) -> str:
+        if not drv:
             return "Error: browser not open"
         try:
             script = """
@@ -437,7 +636,7 @@ class Tools:
                 }
                 return { ok: true, cancelled };
             """
-            res = Tools._driver.execute_script(script, float(x), float(y), float(delta_x), float(delta_y))
+            res = drv.execute_script(script, float(x), float(y), float(delta_x), float(delta_y))
             if not isinstance(res, dict) or not res.get("ok"):
                 reason = res.get("reason") if isinstance(res, dict) else "unknown"
                 return f"Error scrolling at point: {reason}"
@@ -448,12 +647,17 @@ class Tools:
             return f"Error scrolling at point: {exc}"
 
     @staticmethod
-    def sync_input(value: str, selector: str = "", submit: bool = False, input_type: str = "", data: Optional[str] = None) -> str:
-        if not Tools._driver:
+    def sync_input(
+        drv: Optional[webdriver.Chrome],
+        value: str,
+        selector: str = "",
+        submit: bool = False,
+        input_type: str = "",
+        data: Optional[str] = None,
+    ) -> str:
+        if not drv:
             return "Error: browser not open"
         try:
-            drv = Tools._driver
-
             script = """
                 const selector = arguments[0];
                 const value = arguments[1];
@@ -570,6 +774,18 @@ RATE_LIMIT_WHITELIST = {
 FILE_TTL_S = max(60, int(os.getenv("SCRAPE_FILE_TTL_S", "900")))
 FRAME_KEEPALIVE_S = max(10, int(os.getenv("SCRAPE_FRAME_KEEPALIVE_S", "45")))
 HEADLESS_DEFAULT = os.getenv("SCRAPE_HEADLESS_DEFAULT", "1") in ("1", "true", "TRUE", "yes")
+# 1 (the default) relaunches every released browser: _reset cannot clear per-origin storage
+# (localStorage, IndexedDB, ...), so reuse lets it leak into the next client's session.
+MAX_USES_PER_INSTANCE = max(0, int(os.getenv("SCRAPE_MAX_USES_PER_INSTANCE", "1")))
+SSE_COALESCE_MS = max(0, int(os.getenv("SCRAPE_SSE_COALESCE_MS", "15")))
+# Each open /events stream occupies a server thread for its whole life, so the server
+# gets HTTP_THREADS for ordinary requests on top of MAX_SSE_STREAMS for streams.
+HTTP_THREADS = max(4, int(os.getenv("SCRAPE_HTTP_THREADS", str(MAX_CONCURRENCY * 4))))
+MAX_SSE_STREAMS = max(1, int(os.getenv("SCRAPE_MAX_SSE_STREAMS", "16")))
+# Internal nginx location that maps onto OUT_DIR; when set, /frames hands the file off to the proxy.
+XACCEL_PREFIX = (os.getenv("SCRAPE_XACCEL_PREFIX") or "").strip()
+if XACCEL_PREFIX and not XACCEL_PREFIX.endswith("/"):
+    XACCEL_PREFIX += "/"
 
 app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": "*"}})
@@ -577,93 +793,358 @@ CORS(app, resources={r"/*": {"origins": "*"}})
 # ──────────────────────────────────────────────────────────────
 # 4) Service state
 # ──────────────────────────────────────────────────────────────
+# _GLOBAL_LOCK serializes writers of the session tables (insert, pop, clear, and any
+# read-modify-write). Readers skip it: a single dict.get or attribute store
+# runs without releasing the GIL, so they see either the old state or the new one.
 _GLOBAL_LOCK = threading.Lock()
-_SESSIONS: Dict[str, dict] = {}
-_SESSION_EVENTS: Dict[str, Queue] = {}
-_CONC_SEM = threading.BoundedSemaphore(MAX_CONCURRENCY)
-_RATE_BUCKETS: Dict[str, dict] = {}
-_RATE_LOCK = threading.Lock()
+_SESSIONS: Dict[str, "Session"] = {}
+_SESSION_EVENTS: Dict[str, "EventBuf"] = {}
+# Sid used when a request names none: the most recently started session. Only
+# written under _GLOBAL_LOCK; readers take the plain global load.
+_CURRENT_SID: str = ""
+_CONC_SEM = threading.Semaphore(MAX_CONCURRENCY)
+_RATE_SHARD_MASK = 15
+_RATE_CAP = 4096  # buckets per shard; the least recently seen IP is evicted beyond this
+_RATE_IDLE_S = 300.0
+
+
+class _RateBucket:
+    __slots__ = ("tokens", "ts")
+
+    def __init__(self, tokens: float, ts: float) -> None:
+        self.tokens = tokens
+        self.ts = ts
+
+
+# Buckets are sharded by IP hash, each shard an LRU-ordered dict behind its own lock,
+# so concurrent clients contend on 1/16th of the traffic and memory stays bounded.
+_RATE_SHARDS = [(threading.Lock(), OrderedDict()) for _ in range(_RATE_SHARD_MASK + 1)]
+
+
+class DriverPool:
+    """Bounded set of warm Chrome drivers, filled lazily and recycled after use."""
+
+    def __init__(self, size: int, headless: bool, max_uses: int = 0) -> None:
+        self.size = max(1, int(size))
+        self.headless = headless
+        self.max_uses = max(0, int(max_uses))
+        self._idle: Queue = Queue()
+        self._lock = threading.Lock()
+        self._live = 0
+        self._uses: Dict[int, int] = {}
+        self._warmed = False
+
+    def _reserve(self) -> bool:
+        with self._lock:
+            if self._live >= self.size:
+                return False
+            self._live += 1
+            return True
+
+    def _unreserve(self) -> None:
+        with self._lock:
+            self._live = max(0, self._live - 1)
+
+    def _launch(self) -> Tuple[webdriver.Chrome, str]:
+        try:
+            drv, msg = Tools.launch_driver(headless=self.headless)
+        except Exception:
+            self._unreserve()
+            raise
+        with self._lock:
+            self._uses[id(drv)] = 0
+        return drv, msg
+
+    def _fill_one(self) -> None:
+        try:
+            drv, _ = self._launch()
+        except Exception as exc:
+            log_message(f"[pool] warm-up launch failed: {exc}", "WARNING")
+            return
+        self._idle.put(drv)
+
+    def _spawn(self) -> None:
+        if self._reserve():
+            threading.Thread(target=self._fill_one, daemon=True).start()
+
+    def warm(self) -> None:
+        with self._lock:
+            if self._warmed:
+                return
+            self._warmed = True
+            missing = self.size - self._live
+        for _ in range(missing):
+            self._spawn()
+
+    def acquire(self, timeout: Optional[float] = None) -> Tuple[webdriver.Chrome, str]:
+        """Check out a driver, launching one only while the pool is below capacity."""
+        try:
+            return self._idle.get_nowait(), "Browser ready (pooled)"
+        except Empty:
+            pass
+        if self._reserve():
+            drv, msg = self._launch()
+            self.warm()
+            return drv, msg
+        wait = float(QUEUE_TIMEOUT_S if timeout is None else timeout)
+        try:
+            drv = self._idle.get(timeout=wait if wait > 0 else None)
+        except Empty:
+            raise TimeoutError("browser pool exhausted")
+        return drv, "Browser ready (pooled)"
+
+    def release(self, drv: Optional[webdriver.Chrome], discard: bool = False) -> None:
+        if drv is None:
+            return
+        key = id(drv)
+        with self._lock:
+            pooled = key in self._uses
+            uses = self._uses.get(key, 0) + 1
+            if pooled:
+                self._uses[key] = uses
+        if not pooled:
+            Tools.quit_driver(drv)
+            return
+        if discard or (self.max_uses and uses >= self.max_uses) or not self._reset(drv):
+            self._retire(drv)
+            return
+        self._idle.put(drv)
+
+    @contextlib.contextmanager
+    def checkout(self, timeout: Optional[float] = None):
+        drv, _ = self.acquire(timeout)
+        try:
+            yield drv
+        except WebDriverException:
+            self.release(drv, discard=True)
+            raise
+        except BaseException:
+            self.release(drv)
+            raise
+        self.release(drv)
+
+    def _reset(self, drv: webdriver.Chrome) -> bool:
+        try:
+            # Only reached when reuse is opted into (max_uses > 1). CDP has no wildcard origin, so
+            # origin storage survives; cookies and the HTTP cache do not.
+            drv.get("about:blank")
+            drv.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            drv.execute_cdp_cmd("Network.clearBrowserCache", {})
+            return True
+        except Exception as exc:
+            log_message(f"[pool] reset failed, recycling driver: {exc}", "WARNING")
+            return False
+
+    def _retire(self, drv: webdriver.Chrome) -> None:
+        with self._lock:
+            self._uses.pop(id(drv), None)
+            self._live = max(0, self._live - 1)
+        threading.Thread(target=Tools.quit_driver, args=(drv,), daemon=True).start()
+        self._spawn()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": self.size, "live": self._live, "idle": self._idle.qsize()}
+
+    def close_all(self) -> None:
+        while True:
+            try:
+                drv = self._idle.get_nowait()
+            except Empty:
+                break
+            with self._lock:
+                self._uses.pop(id(drv), None)
+                self._live = max(0, self._live - 1)
+            Tools.quit_driver(drv)
+
+
+_POOL = DriverPool(MAX_CONCURRENCY, HEADLESS_DEFAULT, MAX_USES_PER_INSTANCE)
+# Callers that may find every browser reserved never wait on the pool indefinitely.
+_POOL_WAIT_S = max(QUEUE_TIMEOUT_S, 5.0)
+# Serializes "evict the LRU session, claim the freed browser, register the new session",
+# so concurrent /session/start calls never evict the same session for two callers.
+_START_LOCK = threading.Lock()
+
+
+class EventBuf:
+    """Per-session backlog of encoded SSE messages; the bounded deque drops the oldest."""
+
+    __slots__ = ("dq", "cond")
+
+    def __init__(self, maxlen: int = 256) -> None:
+        self.dq: deque = deque(maxlen=maxlen)
+        self.cond = threading.Condition(threading.Lock())
+
+
+class Session:
+    """Bookkeeping for one sid; ``driver`` is the pooled browser it has reserved, if any.
+
+    ``busy`` counts requests currently driving the browser and ``dropped`` marks a closed
+    session; both are guarded by _GLOBAL_LOCK. A dropped session's browser goes back to the
+    pool only once ``busy`` reaches zero, so a request in flight never ends up driving the
+    browser of whichever session is handed it next.
+    """
+
+    __slots__ = ("created", "last", "headless", "frames", "driver", "busy", "dropped")
+
+    def __init__(self, headless: bool, driver: Optional[webdriver.Chrome] = None) -> None:
+        self.created = self.last = time.time()
+        self.headless = headless
+        self.frames: Dict[str, FrameMeta] = {}
+        self.driver = driver
+        self.busy = 0
+        self.dropped = False
+
+
+class _Driving:
+    """``with _Driving(meta) as drv``: the session's browser, pinned for the block (None once dropped)."""
+
+    __slots__ = ("meta",)
+
+    def __init__(self, meta: Optional[Session]) -> None:
+        self.meta = meta
+
+    def __enter__(self) -> Optional[webdriver.Chrome]:
+        meta = self.meta
+        if meta is None:
+            return None
+        with _GLOBAL_LOCK:
+            if meta.dropped:
+                self.meta = None
+                return None
+            meta.busy += 1
+            return meta.driver
+
+    def __exit__(self, *exc) -> bool:
+        meta = self.meta
+        if meta is None:
+            return False
+        with _GLOBAL_LOCK:
+            meta.busy -= 1
+            drv = _detach_driver(meta) if meta.dropped else None
+        _POOL.release(drv)
+        return False
+
+
+class FrameMeta:
+    __slots__ = ("ts", "width", "height")
 
+    def __init__(self, ts: int, width: int, height: int) -> None:
+        self.ts = ts
+        self.width = width
+        self.height = height
 
+
+@contextlib.contextmanager
 def _slot(timeout: Optional[float] = None):
-    class _Slot:
-        def __init__(self, timeout_val: Optional[float]):
-            self.timeout = float(QUEUE_TIMEOUT_S if timeout_val is None else timeout_val)
-            self.acquired = False
-
-        def __enter__(self):
-            if self.timeout <= 0:
-                _CONC_SEM.acquire()
-                self.acquired = True
-            else:
-                self.acquired = _CONC_SEM.acquire(timeout=self.timeout)
-                if not self.acquired:
-                    raise TimeoutError("scrape at capacity")
-            return self
-
-        def __exit__(self, exc_type, exc, tb):
-            if self.acquired:
-                try:
-                    _CONC_SEM.release()
-                except Exception:
-                    pass
-
-    return _Slot(timeout)
-
-
-def _session_meta(sid: str) -> Optional[dict]:
-    with _GLOBAL_LOCK:
-        return _SESSIONS.get(sid)
+    wait = float(QUEUE_TIMEOUT_S if timeout is None else timeout)
+    # A non-positive timeout means block until a slot frees up.
+    if not _CONC_SEM.acquire(timeout=wait if wait > 0 else None):
+        raise TimeoutError("scrape at capacity")
+    try:
+        yield
+    finally:
+        _CONC_SEM.release()
 
 
-def _ensure_session(sid: str) -> Queue:
-    with _GLOBAL_LOCK:
-        meta = _SESSIONS.setdefault(
-            sid,
-            {
-                "created": time.time(),
-                "last": time.time(),
-                "headless": HEADLESS_DEFAULT,
-                "frames": {},
-            },
-        )
-        meta["last"] = time.time()
-        if sid not in _SESSION_EVENTS:
-            _SESSION_EVENTS[sid] = Queue(maxsize=256)
-        return _SESSION_EVENTS[sid]
+def _ts_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+def _status_event(msg: str, **extra) -> dict:
+    payload = {"type": "status", "msg": msg, "ts": _ts_ms()}
+    payload.update(extra)
+    return payload
+
+
+def _session_meta(sid: str) -> Optional[Session]:
+    return _SESSIONS.get(sid)
+
+
+def _ensure_session(sid: str) -> EventBuf:
+    meta = _SESSIONS.get(sid)
+    buf = _SESSION_EVENTS.get(sid)
+    if meta is None or buf is None:
+        created = False
+        with _GLOBAL_LOCK:
+            meta = _SESSIONS.get(sid)
+            if meta is None:
+                meta = _SESSIONS[sid] = Session(HEADLESS_DEFAULT)
+                created = True
+            buf = _SESSION_EVENTS.setdefault(sid, EventBuf(256))
+        if created:
+            _arm_expiry(sid)
+    meta.last = time.time()
+    return buf
 
 
 def _touch_session(sid: str) -> None:
-    with _GLOBAL_LOCK:
-        meta = _SESSIONS.get(sid)
-        if meta is not None:
-            meta["last"] = time.time()
+    meta = _SESSIONS.get(sid)
+    if meta is not None:
+        meta.last = time.time()
+
+
+def _detach_driver(meta: Session) -> Optional[webdriver.Chrome]:
+    """Mark ``meta`` dropped and take its browser, unless a request is still using it.
+
+    Caller holds _GLOBAL_LOCK; the last _Driving block to exit releases a deferred browser.
+    """
+    meta.dropped = True
+    if meta.busy:
+        return None
+    drv, meta.driver = meta.driver, None
+    return drv
 
 
-def _session_ids() -> list[str]:
+def _drop_session(sid: str) -> bool:
+    global _CURRENT_SID
     with _GLOBAL_LOCK:
-        return list(_SESSIONS.keys())
+        meta = _SESSIONS.pop(sid, None)
+        _SESSION_EVENTS.pop(sid, None)
+        if _CURRENT_SID == sid:
+            _CURRENT_SID = next(
+                (other for other, m in reversed(_SESSIONS.items()) if m.driver is not None), ""
+            )
+        had_driver = meta is not None and meta.driver is not None
+        drv = _detach_driver(meta) if meta else None
+    _POOL.release(drv)
+    return had_driver
+
+
+def _evict_lru_session() -> None:
+    # Starting a session with every pool slot reserved used to replace the single browser;
+    # keep that behaviour by handing back the least recently used reservation.
+    with _GLOBAL_LOCK:
+        held = [(meta.busy > 0, meta.last, sid) for sid, meta in _SESSIONS.items() if meta.driver is not None]
+    if len(held) < _POOL.size:
+        return
+    # Idle sessions go first; a busy one keeps its browser until its request finishes.
+    _, _, sid = min(held)
+    log_message(f"[pool] releasing least recently used session {sid}", "DEBUG")
+    _drop_session(sid)
 
 
-def _clear_sessions() -> None:
+def _clear_sessions() -> int:
+    global _CURRENT_SID
     with _GLOBAL_LOCK:
+        held = sum(meta.driver is not None for meta in _SESSIONS.values())
+        drivers = [_detach_driver(meta) for meta in _SESSIONS.values()]
         _SESSIONS.clear()
         _SESSION_EVENTS.clear()
+        _CURRENT_SID = ""
+    for drv in drivers:
+        _POOL.release(drv)
+    return held
 
 
 def _queue_event(sid: str, payload: dict) -> None:
-    q = _ensure_session(sid)
-    try:
-        q.put_nowait(payload)
-    except Exception:
-        try:
-            q.get_nowait()
-        except Exception:
-            pass
-        try:
-            q.put_nowait(payload)
-        except Exception:
-            pass
+    # Framed once here, off the stream thread. Like the old Queue, each event goes to exactly
+    # one /events reader: _sse_iter drains the shared deque, so readers of a sid split the events.
+    message = _sse_message(payload)
+    buf = _ensure_session(sid)
+    with buf.cond:
+        buf.dq.append(message)
+        buf.cond.notify()
 
 
 def _result_ok(message: str) -> bool:
@@ -698,97 +1179,314 @@ def _is_local_ip(ip: str) -> bool:
 # 5) Rate limit & auth helpers
 # ──────────────────────────────────────────────────────────────
 def _now() -> float:
-    return time.time()
+    return time.monotonic()
 
 
-@app.before_request
-def _apply_rate_limit():
-    forwarded = request.headers.get("X-Forwarded-For", "").split(",")[0].strip()
-    ip = _sanitize_ip(forwarded or request.remote_addr or "0.0.0.0")
-    if RATE_LIMIT_DISABLED or (RATE_LIMIT_LOCAL_BYPASS and _is_local_ip(ip)) or ip in RATE_LIMIT_WHITELIST:
-        g.client_ip = ip
-        return
+def _rate_exempt(ip: str) -> bool:
+    return RATE_LIMIT_DISABLED or (RATE_LIMIT_LOCAL_BYPASS and _is_local_ip(ip)) or ip in RATE_LIMIT_WHITELIST
+
+
+def _take_tokens(ip: str, cost: float = 1.0) -> bool:
+    if cost <= 0 or _rate_exempt(ip):
+        return True
     now = _now()
-    with _RATE_LOCK:
-        bucket = _RATE_BUCKETS.get(ip)
-        if not bucket:
-            bucket = {"tokens": float(RATE_LIMIT_BURST), "ts": now}
-            _RATE_BUCKETS[ip] = bucket
-        elapsed = max(0.0, now - bucket.get("ts", now))
-        bucket["ts"] = now
-        tokens = min(float(RATE_LIMIT_BURST), float(bucket.get("tokens", RATE_LIMIT_BURST)) + elapsed * RATE_LIMIT_RPS)
-        if tokens < 1.0:
-            return jsonify({"ok": False, "error": "rate limit"}), 429, {"Retry-After": "1"}
-        bucket["tokens"] = tokens - 1.0
-    g.client_ip = ip
+    shard_lock, buckets = _RATE_SHARDS[hash(ip) & _RATE_SHARD_MASK]
+    with shard_lock:
+        bucket = buckets.get(ip)
+        if bucket is None:
+            bucket = buckets[ip] = _RateBucket(float(RATE_LIMIT_BURST), now)
+            if len(buckets) > _RATE_CAP:
+                buckets.popitem(last=False)
+        else:
+            buckets.move_to_end(ip)
+        elapsed = max(0.0, now - bucket.ts)
+        bucket.ts = now
+        tokens = min(float(RATE_LIMIT_BURST), bucket.tokens + elapsed * RATE_LIMIT_RPS)
+        if tokens < cost:
+            bucket.tokens = tokens
+            return False
+        bucket.tokens = tokens - cost
+    return True
+
+
+def _sweep_rate_buckets() -> None:
+    cutoff = _now() - _RATE_IDLE_S
+    for shard_lock, buckets in _RATE_SHARDS:
+        with shard_lock:
+            # LRU order means idle buckets sit at the front.
+            while buckets and next(iter(buckets.values())).ts < cutoff:
+                buckets.popitem(last=False)
+
+
+def _rate_limited():
+    return _json_response({"ok": False, "error": "rate limit"}, 429, {"Retry-After": "1"})
+
+
+# Cheap or long-lived endpoints: static frames, the SSE stream, and health probes.
+_RATE_EXEMPT_ENDPOINTS = frozenset({"frames", "events", "health"})
+
+
+_API_KEY_B = API_KEY.encode("utf-8")
 
 
 def _auth_ok(req) -> bool:
     if not AUTH_REQUIRED:
         return True
-    header_key = (req.headers.get("X-API-Key") or "").strip()
-    if API_KEY and header_key and header_key == API_KEY:
-        return True
-    auth = (req.headers.get("Authorization") or "").strip()
-    if auth.lower().startswith("bearer ") and API_KEY and auth.split(None, 1)[1].strip() == API_KEY:
+    if not _API_KEY_B:
+        return False
+    header_key = req.headers.get("X-API-Key")
+    if header_key and hmac.compare_digest(header_key.strip().encode("utf-8", "ignore"), _API_KEY_B):
         return True
+    auth = req.headers.get("Authorization", "")
+    if len(auth) > 7 and auth[:7].lower() == "bearer ":
+        return hmac.compare_digest(auth[7:].strip().encode("utf-8", "ignore"), _API_KEY_B)
     return False
 
 
+# Every route except /health sits behind the API key, including any added later.
+_PUBLIC = frozenset({"health"})
+
+
+@app.before_request
+def _prepare_request():
+    """Rate limit, authenticate and resolve the target sid once, ahead of every route."""
+    forwarded = request.headers.get("X-Forwarded-For", "").split(",")[0].strip()
+    ip = _sanitize_ip(forwarded or request.remote_addr or "0.0.0.0")
+    g.client_ip = ip
+    endpoint = request.endpoint
+    if endpoint not in _RATE_EXEMPT_ENDPOINTS and not _take_tokens(ip):
+        return _rate_limited()
+    # CORS preflights never carry credentials.
+    g.authed = request.method == "OPTIONS" or endpoint in _PUBLIC or _auth_ok(request)
+    if not g.authed:
+        return _error("unauthorized", 401)
+    g.sid = request.args.get("sid") or _json_body(request).get("sid") or _CURRENT_SID
+    # Resolved once here; routes pin g.session's browser with _Driving for the Selenium call.
+    g.session = _session_meta(g.sid)
+    g.driver = g.session.driver if g.session is not None else None
+
+
 # ──────────────────────────────────────────────────────────────
 # 6) Background cleaners
 # ──────────────────────────────────────────────────────────────
-_CLEAN_STOP = threading.Event()
+# Sessions idle this long are dropped when their expiry entry comes due.
+_SESSION_IDLE_S = max(FILE_TTL_S, 2 * FRAME_KEEPALIVE_S)
+# Deferred work (session expiry, frame GC) as a heap of (deadline, seq, fn, arg), run by
+# one scheduler thread that sleeps until the earliest deadline and never polls.
+_SCHED_HEAP: list = []
+_SCHED_COND = threading.Condition(threading.Lock())
+_SCHED_SEQ = itertools.count()
+_SCHED_STOP = threading.Event()
+# Whether a frame GC is queued; guarded by _GLOBAL_LOCK.
+_GC_PENDING = False
+# (ts_ms, path) of every frame on disk, oldest first, so expiry never rescans OUT_DIR.
+_FRAME_FILES: deque = deque()
+
+
+# Disk writes for frames run here so the concurrency slot only covers the Selenium call.
+_IO_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="scrape-io")
+# Frame name -> write still in flight; /frames waits on it instead of missing the file.
+_PENDING_FRAMES: Dict[str, Future] = {}
+_FRAME_WRITE_WAIT_S = 5.0
+
+
+def _schedule(delay: float, fn, arg=None) -> None:
+    with _SCHED_COND:
+        heapq.heappush(_SCHED_HEAP, (time.time() + max(0.0, delay), next(_SCHED_SEQ), fn, arg))
+        _SCHED_COND.notify()
+
+
+def _scheduler_loop() -> None:
+    while True:
+        with _SCHED_COND:
+            while not _SCHED_STOP.is_set():
+                if _SCHED_HEAP:
+                    wait = _SCHED_HEAP[0][0] - time.time()
+                    if wait <= 0:
+                        break
+                else:
+                    wait = None
+                _SCHED_COND.wait(wait)
+            if _SCHED_STOP.is_set():
+                return
+            _, _, fn, arg = heapq.heappop(_SCHED_HEAP)
+        try:
+            fn(arg)
+        except Exception as exc:
+            log_message(f"[scheduler] {getattr(fn, '__name__', fn)} failed: {exc}", "WARNING")
 
 
-def _cleanup_old_frames() -> None:
-    while not _CLEAN_STOP.is_set():
-        now = time.time()
-        for path in OUT_DIR.glob("*.png"):
+def _track_frame_file(path: Path) -> None:
+    global _GC_PENDING
+    with _GLOBAL_LOCK:
+        _FRAME_FILES.append((_ts_ms(), path))
+        if _GC_PENDING:
+            return
+        _GC_PENDING = True
+    _schedule(FILE_TTL_S, _gc_once)
+
+
+def _write_frame(path: Path, png: bytes) -> None:
+    try:
+        path.write_bytes(png)
+    except OSError as exc:
+        log_message(f"failed to store frame {path.name}: {exc}", "ERROR")
+        return
+    _track_frame_file(path)
+
+
+def _submit_frame_write(fname: str, png: bytes) -> None:
+    fut = _IO_POOL.submit(_write_frame, OUT_DIR / fname, png)
+    with _GLOBAL_LOCK:
+        _PENDING_FRAMES[fname] = fut
+    # Runs immediately if the write already finished, so no entry is left behind.
+    fut.add_done_callback(lambda _: _PENDING_FRAMES.pop(fname, None))
+
+
+def _await_frame_write(fname: str) -> None:
+    pending = _PENDING_FRAMES.get(fname)
+    if pending is not None:
+        with contextlib.suppress(Exception):
+            pending.result(timeout=_FRAME_WRITE_WAIT_S)
+
+
+def _seed_frame_files() -> None:
+    # Frames left behind by a previous run are picked up once at startup.
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+    found = []
+    with os.scandir(OUT_DIR) as it:
+        for entry in it:
+            if not entry.name.endswith(".png"):
+                continue
             try:
-                age = now - path.stat().st_mtime
+                found.append((int(entry.stat(follow_symlinks=False).st_mtime * 1000), Path(entry.path)))
             except FileNotFoundError:
                 continue
-            if age > FILE_TTL_S:
-                with contextlib.suppress(Exception):
-                    path.unlink()
-        for sid in _session_ids():
-            meta = _session_meta(sid)
-            if not meta:
-                continue
-            last = meta.get("last", 0)
-            if now - last > max(FILE_TTL_S, 2 * FRAME_KEEPALIVE_S):
-                with _GLOBAL_LOCK:
-                    _SESSIONS.pop(sid, None)
-                    _SESSION_EVENTS.pop(sid, None)
-        _CLEAN_STOP.wait(30.0)
+    found.sort(key=lambda item: item[0])
+    with _GLOBAL_LOCK:
+        _FRAME_FILES.extendleft(reversed(found))
+
+
+def _expire_frame_files(now: float) -> None:
+    cutoff = int((now - FILE_TTL_S) * 1000)
+    expired = []
+    with _GLOBAL_LOCK:
+        while _FRAME_FILES and _FRAME_FILES[0][0] < cutoff:
+            expired.append(_FRAME_FILES.popleft()[1])
+    for path in expired:
+        with contextlib.suppress(Exception):
+            path.unlink()
+
+
+def _gc_once(_=None) -> None:
+    """Expire old frames, then queue the next run for when the oldest remaining one is due."""
+    global _GC_PENDING
+    now = time.time()
+    _expire_frame_files(now)
+    # The per-shard LRU cap already bounds memory; this only trims buckets gone idle.
+    _sweep_rate_buckets()
+    with _GLOBAL_LOCK:
+        if not _FRAME_FILES:
+            _GC_PENDING = False
+            return
+        delay = _FRAME_FILES[0][0] / 1000.0 + FILE_TTL_S - now
+    _schedule(delay, _gc_once)
+
+
+def _arm_expiry(sid: str, delay: float = _SESSION_IDLE_S) -> None:
+    _schedule(delay, _expire_session, sid)
+
+
+def _expire_session(sid: str) -> None:
+    # Touches only bump Session.last; an entry that comes due early re-arms for the rest.
+    meta = _SESSIONS.get(sid)
+    if meta is None:
+        return
+    idle = time.time() - meta.last
+    if idle < _SESSION_IDLE_S:
+        _arm_expiry(sid, _SESSION_IDLE_S - idle)
+        return
+    log_message(f"[session] expiring idle session {sid}", "DEBUG")
+    _drop_session(sid)
 
 
 import atexit  # noqa: E402
-import contextlib  # noqa: E402
 
-_clean_thread = threading.Thread(target=_cleanup_old_frames, daemon=True)
-_clean_thread.start()
+_seed_frame_files()
+_GC_PENDING = True
+_schedule(0.0, _gc_once)
+threading.Thread(target=_scheduler_loop, name="scrape-scheduler", daemon=True).start()
 
 
 @atexit.register
 def _shutdown_cleanup():
-    _CLEAN_STOP.set()
+    with _SCHED_COND:
+        _SCHED_STOP.set()
+        _SCHED_COND.notify()
+    with contextlib.suppress(Exception):
+        _IO_POOL.shutdown(wait=True)
     with contextlib.suppress(Exception):
-        _clean_thread.join(timeout=2.0)
+        _clear_sessions()
+        _POOL.close_all()
 
 
 # ──────────────────────────────────────────────────────────────
 # 7) Utility responses
 # ──────────────────────────────────────────────────────────────
+_JSON_SEPS = (",", ":")
+_CACHE_CTRL = "no-store, max-age=0"
+_ACAH = "Content-Type, Authorization, X-API-Key"
+
+
+def _json_bytes(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=_JSON_SEPS).encode("utf-8")
+
+
+def _json_loads(raw: bytes):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _json_response(obj, status: int = 200, headers: Optional[dict] = None) -> Response:
+    return Response(_json_bytes(obj), status=status, headers=headers, mimetype="application/json")
+
+
+def _json_body(req) -> dict:
+    """Request body as a dict, parsed once per request; anything else reads as empty."""
+    body = g.get("json_body")
+    if body is None:
+        raw = req.get_data(cache=True)
+        try:
+            body = _json_loads(raw) if raw else {}
+        except ValueError:
+            body = {}
+        if not isinstance(body, dict):
+            body = {}
+        g.json_body = body
+    return body
+
+
 def _ok(**kwargs):
-    data = {"ok": True}
-    data.update(kwargs)
-    return jsonify(data)
+    kwargs["ok"] = True
+    return _json_response(kwargs)
 
 
 def _error(message: str, status: int = 400):
-    return jsonify({"ok": False, "error": str(message)}), status
+    return _json_response({"ok": False, "error": str(message)}, status)
+
+
+def _encoded_response(body: bytes, content_type: str, headers: Optional[dict] = None) -> Response:
+    """Gzip ``body`` (level 1: most of the ratio at a fraction of the CPU) when the client accepts it."""
+    headers = dict(headers or {})
+    headers["Vary"] = "Accept-Encoding"
+    if request.accept_encodings["gzip"]:
+        body = gzip.compress(body, compresslevel=1)
+        headers["Content-Encoding"] = "gzip"
+    # content_type is sent verbatim; mimetype= would have werkzeug append its own charset.
+    return Response(body, content_type=content_type, headers=headers)
 
 
 # ──────────────────────────────────────────────────────────────
@@ -796,54 +1494,57 @@ def _error(message: str, status: int = 400):
 # ──────────────────────────────────────────────────────────────
 @app.get("/health")
 def health():
-    return jsonify({"status": "ok", "browser_open": Tools.is_browser_open(), "sessions": len(_SESSIONS)})
+    stats = _POOL.stats()
+    return _json_response({"status": "ok", "browser_open": stats["live"] > 0, "sessions": len(_SESSIONS), "pool": stats})
 
 
 @app.post("/session/start")
 def session_start():
-    if not _auth_ok(request):
-        return _error("unauthorized", 401)
-    payload = request.get_json(silent=True) or {}
+    global _CURRENT_SID
+    payload = _json_body(request)
     headless = bool(payload.get("headless", HEADLESS_DEFAULT))
-    with _slot():
-        msg = Tools.open_browser(headless=headless, force_new=True)
-    if not _result_ok(msg):
-        return _error(msg, 500)
     sid = uuid.uuid4().hex
-    with _GLOBAL_LOCK:
-        _SESSIONS.clear()
-        _SESSION_EVENTS.clear()
-        _SESSIONS[sid] = {
-            "created": time.time(),
-            "last": time.time(),
-            "headless": headless,
-            "frames": {},
-        }
-    _queue_event(sid, {"type": "status", "msg": "browser_started", "detail": msg, "sid": sid, "ts": int(time.time() * 1000)})
+    try:
+        if headless == _POOL.headless:
+            # The pool bounds its own launches, so no concurrency slot is held while waiting.
+            with _START_LOCK:
+                _evict_lru_session()
+                drv, msg = _POOL.acquire(_POOL_WAIT_S)
+                with _GLOBAL_LOCK:
+                    _SESSIONS[sid] = Session(headless, drv)
+                    _CURRENT_SID = sid
+        else:
+            with _slot():
+                drv, msg = Tools.launch_driver(headless=headless)
+            with _GLOBAL_LOCK:
+                _SESSIONS[sid] = Session(headless, drv)
+                _CURRENT_SID = sid
+    except RuntimeError as exc:
+        return _error(str(exc), 500)
+    _arm_expiry(sid)
+    _queue_event(sid, _status_event("browser_started", detail=msg, sid=sid))
     return _ok(session_id=sid, message=msg, headless=headless)
 
 
 @app.post("/session/close")
 def session_close():
-    if not _auth_ok(request):
-        return _error("unauthorized", 401)
+    data = _json_body(request)
+    sid = (data.get("sid") or "").strip()
     with _slot():
-        msg = Tools.close_browser()
-    _clear_sessions()
-    return _ok(message=msg)
+        closed = _drop_session(sid) if sid else _clear_sessions() > 0
+    return _ok(message="Browser closed" if closed else "No browser to close")
 
 
 @app.post("/navigate")
 def navigate():
-    if not _auth_ok(request):
-        return _error("unauthorized", 401)
-    data = request.get_json(silent=True) or {}
+    data = _json_body(request)
     url = (data.get("url") or "").strip()
     if not url:
         return _error("missing url", 400)
-    with _slot():
-        msg = Tools.navigate(url)
-    _queue_event(data.get("sid") or next(iter(_SESSIONS), ""), {"type": "status", "msg": msg, "ts": int(time.time() * 1000)})
+    sid = g.sid
+    with _slot(), _Driving(g.session) as drv:
+        msg = Tools.navigate(drv, url)
+    _queue_event(sid, _status_event(msg))
     if not _result_ok(msg):
         return _error(msg, 500)
     return _ok(message=msg)
@@ -851,86 +1552,79 @@ def navigate():
 
 @app.post("/click")
 def click_selector():
-    if not _auth_ok(request):
-        return _error("unauthorized", 401)
-    data = request.get_json(silent=True) or {}
+    data = _json_body(request)
     selector = (data.get("selector") or "").strip()
     if not selector:
         return _error("missing selector", 400)
-    with _slot():
-        msg = Tools.click(selector)
+    sid = g.sid
+    with _slot(), _Driving(g.session) as drv:
+        msg = Tools.click(drv, selector)
     if not _result_ok(msg):
         return _error(msg, 500)
-    _queue_event(data.get("sid") or next(iter(_SESSIONS), ""), {"type": "status", "msg": msg, "ts": int(time.time() * 1000)})
+    _queue_event(sid, _status_event(msg))
     return _ok(message=msg)
 
 
 @app.post("/type")
 def type_text():
-    if not _auth_ok(request):
-        return _error("unauthorized", 401)
-    data = request.get_json(silent=True) or {}
+    data = _json_body(request)
     selector = (data.get("selector") or "").strip()
     text = data.get("text")
     if not selector:
         return _error("missing selector", 400)
     if text is None:
         return _error("missing text", 400)
-    with _slot():
-        msg = Tools.input(selector, str(text))
+    sid = g.sid
+    with _slot(), _Driving(g.session) as drv:
+        msg = Tools.input(drv, selector, str(text))
     if not _result_ok(msg):
         return _error(msg, 500)
-    _queue_event(data.get("sid") or next(iter(_SESSIONS), ""), {"type": "status", "msg": msg, "ts": int(time.time() * 1000)})
+    _queue_event(sid, _status_event(msg))
     return _ok(message=msg)
 
 
 @app.post("/scroll")
 def scroll():
-    if not _auth_ok(request):
-        return _error("unauthorized", 401)
-    data = request.get_json(silent=True) or {}
+    data = _json_body(request)
     amount = int(data.get("amount", 600))
-    with _slot():
-        msg = Tools.scroll(amount)
+    sid = g.sid
+    with _slot(), _Driving(g.session) as drv:
+        msg = Tools.scroll(drv, amount)
     if not _result_ok(msg):
         return _error(msg, 500)
-    _queue_event(data.get("sid") or next(iter(_SESSIONS), ""), {"type": "status", "msg": msg, "ts": int(time.time() * 1000)})
+    _queue_event(sid, _status_event(msg))
     return _ok(message=msg)
 
 
 @app.post("/scroll/up")
 def scroll_up():
-    if not _auth_ok(request):
-        return _error("unauthorized", 401)
-    data = request.get_json(silent=True) or {}
+    data = _json_body(request)
     amount = abs(int(data.get("amount", 600)))
-    with _slot():
-        msg = Tools.scroll(-amount)
+    sid = g.sid
+    with _slot(), _Driving(g.session) as drv:
+        msg = Tools.scroll(drv, -amount)
     if not _result_ok(msg):
         return _error(msg, 500)
-    _queue_event(data.get("sid") or next(iter(_SESSIONS), ""), {"type": "status", "msg": msg, "ts": int(time.time() * 1000)})
+    _queue_event(sid, _status_event(msg))
     return _ok(message=msg)
 
 
 @app.post("/scroll/down")
 def scroll_down():
-    if not _auth_ok(request):
-        return _error("unauthorized", 401)
-    data = request.get_json(silent=True) or {}
+    data = _json_body(request)
     amount = abs(int(data.get("amount", 600)))
-    with _slot():
-        msg = Tools.scroll(amount)
+    sid = g.sid
+    with _slot(), _Driving(g.session) as drv:
+        msg = Tools.scroll(drv, amount)
     if not _result_ok(msg):
         return _error(msg, 500)
-    _queue_event(data.get("sid") or next(iter(_SESSIONS), ""), {"type": "status", "msg": msg, "ts": int(time.time() * 1000)})
+    _queue_event(sid, _status_event(msg))
     return _ok(message=msg)
 
 
 @app.post("/scroll/point")
 def scroll_point():
-    if not _auth_ok(request):
-        return _error("unauthorized", 401)
-    data = request.get_json(silent=True) or {}
+    data = _json_body(request)
     try:
         x = float(data.get("x"))
         y = float(data.get("y"))
@@ -952,56 +1646,83 @@ def scroll_point():
         f"[scroll_point] ({x:.1f},{y:.1f}) scaled ({vx:.1f},{vy:.1f}) delta ({delta_x:.2f},{delta_y:.2f})",
         "DEBUG"
     )
-    with _slot():
-        msg = Tools.scroll_point(vx, vy, delta_x, delta_y)
+    sid = g.sid
+    with _slot(), _Driving(g.session) as drv:
+        msg = Tools.scroll_point(drv, vx, vy, delta_x, delta_y)
     if not _result_ok(msg):
         return _error(msg, 500)
-    sid = data.get("sid") or next(iter(_SESSIONS), "")
-    _queue_event(
-        sid,
-        {
-            "type": "status",
-            "msg": msg,
-            "detail": {"x": vx, "y": vy, "delta": [delta_x, delta_y]},
-            "ts": int(time.time() * 1000),
-        },
-    )
+    _queue_event(sid, _status_event(msg, detail={"x": vx, "y": vy, "delta": [delta_x, delta_y]}))
     return _ok(message=msg)
 
 
 @app.post("/history/back")
 def history_back():
-    if not _auth_ok(request):
-        return _error("unauthorized", 401)
-    data = request.get_json(silent=True) or {}
-    with _slot():
-        msg = Tools.go_back()
+    sid = g.sid
+    with _slot(), _Driving(g.session) as drv:
+        msg = Tools.go_back(drv)
     if not _result_ok(msg):
         return _error(msg, 500)
-    sid = data.get("sid") or next(iter(_SESSIONS), "")
-    _queue_event(sid, {"type": "status", "msg": msg, "ts": int(time.time() * 1000)})
+    _queue_event(sid, _status_event(msg))
     return _ok(message=msg)
 
 
 @app.post("/history/forward")
 def history_forward():
-    if not _auth_ok(request):
-        return _error("unauthorized", 401)
-    data = request.get_json(silent=True) or {}
-    with _slot():
-        msg = Tools.go_forward()
+    sid = g.sid
+    with _slot(), _Driving(g.session) as drv:
+        msg = Tools.go_forward(drv)
     if not _result_ok(msg):
         return _error(msg, 500)
-    sid = data.get("sid") or next(iter(_SESSIONS), "")
-    _queue_event(sid, {"type": "status", "msg": msg, "ts": int(time.time() * 1000)})
+    _queue_event(sid, _status_event(msg))
     return _ok(message=msg)
 
 
+# Constant source, so every call sends the same script text.
+_CLICK_XY_JS = """
+return (function (x, y) {
+    const el = document.elementFromPoint(x, y);
+    if (!el) return { ok: false, reason: 'element_from_point_null' };
+    try { el.scrollIntoView({ block: 'center', inline: 'center' }); } catch (_) {}
+    const rect = el.getBoundingClientRect();
+    const detail = {
+        tag: el.tagName || '',
+        rect: { x: rect.x, y: rect.y, width: rect.width, height: rect.height },
+        id: el.id || '',
+        name: el.getAttribute('name') || '',
+        type: el.getAttribute('type') || '',
+        role: el.getAttribute('role') || '',
+        contentEditable: !!el.isContentEditable,
+        selector: '',
+        value: ''
+    };
+    const esc = (val) => {
+        if (typeof CSS !== 'undefined' && CSS.escape) return CSS.escape(val);
+        return String(val).replace(/([ !"#$%&'()*+,./:;<=>?@[\\\]^`{|}~])/g, '\\\\$1');
+    };
+    if (detail.id) {
+        detail.selector = `#${esc(detail.id)}`;
+    } else if (detail.name && detail.tag === 'INPUT') {
+        detail.selector = `${detail.tag.toLowerCase()}[name="${detail.name.replace(/"/g, '\\"')}"]`;
+    }
+    if (detail.tag === 'INPUT' || detail.tag === 'TEXTAREA') {
+        detail.value = el.value || '';
+    } else if (el.isContentEditable) {
+        detail.value = el.textContent || '';
+    }
+    try {
+        el.click();
+        if (typeof el.focus === 'function') el.focus();
+        return { ok: true, tag: detail.tag, rect: detail.rect, detail };
+    } catch (err) {
+        return { ok: false, reason: err && err.message ? err.message : String(err) };
+    }
+})(arguments[0], arguments[1]);
+"""
+
+
 @app.post("/click_xy")
 def click_xy():
-    if not _auth_ok(request):
-        return _error("unauthorized", 401)
-    data = request.get_json(silent=True) or {}
+    data = _json_body(request)
     try:
         x = float(data.get("x"))
         y = float(data.get("y"))
@@ -1018,76 +1739,22 @@ def click_xy():
     vx = x * scale_x
     vy = y * scale_y
     log_message(f"[click_xy] requested ({x:.1f}, {y:.1f}) → viewport ({vx:.1f},{vy:.1f})", "DEBUG")
-    with _slot():
-        try:
-            drv = Tools._driver  # type: ignore[attr-defined]
-        except AttributeError:
-            drv = None
-        if not drv:
+    sid = g.sid
+    if g.driver is None:
+        return _error("browser not open", 409)
+    with _slot(), _Driving(g.session) as drv:
+        if drv is None:
             return _error("browser not open", 409)
-        result = drv.execute_script(
-            """
-            const x = arguments[0];
-            const y = arguments[1];
-            const el = document.elementFromPoint(x, y);
-            if (!el) return { ok: false, reason: 'element_from_point_null' };
-            try { el.scrollIntoView({ block: 'center', inline: 'center' }); } catch (_) {}
-            const rect = el.getBoundingClientRect();
-            const detail = {
-                tag: el.tagName || '',
-                rect: { x: rect.x, y: rect.y, width: rect.width, height: rect.height },
-                id: el.id || '',
-                name: el.getAttribute('name') || '',
-                type: el.getAttribute('type') || '',
-                role: el.getAttribute('role') || '',
-                contentEditable: !!el.isContentEditable,
-                selector: '',
-                value: ''
-            };
-            const esc = (val) => {
-                if (typeof CSS !== 'undefined' && CSS.escape) return CSS.escape(val);
-                return String(val).replace(/([ !"#$%&'()*+,./:;<=>?@[\\\]^`{|}~])/g, '\\\\$1');
-            };
-            if (detail.id) {
-                detail.selector = `#${esc(detail.id)}`;
-            } else if (detail.name && detail.tag === 'INPUT') {
-                detail.selector = `${detail.tag.toLowerCase()}[name="${detail.name.replace(/"/g, '\\"')}"]`;
-            }
-            if (detail.tag === 'INPUT' || detail.tag === 'TEXTAREA') {
-                detail.value = el.value || '';
-            } else if (el.isContentEditable) {
-                detail.value = el.textContent || '';
-            }
-            try {
-                el.click();
-                if (typeof el.focus === 'function') el.focus();
-                return { ok: true, tag: detail.tag, rect: detail.rect, detail };
-            } catch (err) {
-                return { ok: false, reason: err && err.message ? err.message : String(err) };
-            }
-            """,
-            float(vx),
-            float(vy),
-        )
+        result = drv.execute_script(_CLICK_XY_JS, float(vx), float(vy))
     if not result or not result.get("ok"):
         return _error(result.get("reason") if isinstance(result, dict) else "click failed", 500)
-    _queue_event(
-        data.get("sid") or next(iter(_SESSIONS), ""),
-        {
-            "type": "status",
-            "msg": "click_xy",
-            "detail": result,
-            "ts": int(time.time() * 1000),
-        },
-    )
+    _queue_event(sid, _status_event("click_xy", detail=result))
     return _ok(message="click_xy", detail=result)
 
 
 @app.post("/input/sync")
 def input_sync():
-    if not _auth_ok(request):
-        return _error("unauthorized", 401)
-    data = request.get_json(silent=True) or {}
+    data = _json_body(request)
     sid = (data.get("sid") or "").strip()
     if not sid:
         return _error("missing sid", 400)
@@ -1097,8 +1764,11 @@ def input_sync():
     input_type = (data.get("inputType") or "").strip()
     data_snippet = data.get("data")
     _touch_session(sid)
-    with _slot():
-        msg = Tools.sync_input(value, selector=selector, submit=submit, input_type=input_type, data=data_snippet)
+    with _slot(), _Driving(g.session) as drv:
+        msg = Tools.sync_input(
+            drv, value,
+            selector=selector, submit=submit, input_type=input_type, data=data_snippet,
+        )
     if not _result_ok(msg):
         return _error(msg, 500)
     return _ok(message=msg)
@@ -1106,9 +1776,7 @@ def input_sync():
 
 @app.post("/drag")
 def drag():
-    if not _auth_ok(request):
-        return _error("unauthorized", 401)
-    data = request.get_json(silent=True) or {}
+    data = _json_body(request)
     try:
         start_x = float(data.get("startX"))
         start_y = float(data.get("startY"))
@@ -1132,36 +1800,138 @@ def drag():
         f"[drag] ({start_x:.1f},{start_y:.1f})→({end_x:.1f},{end_y:.1f}) viewport ({start_vx:.1f},{start_vy:.1f})→({end_vx:.1f},{end_vy:.1f})",
         "DEBUG"
     )
-    with _slot():
-        msg = Tools.drag(start_vx, start_vy, end_vx, end_vy)
+    sid = g.sid
+    with _slot(), _Driving(g.session) as drv:
+        msg = Tools.drag(drv, start_vx, start_vy, end_vx, end_vy)
     if not _result_ok(msg):
         return _error(msg, 500)
-    sid = data.get("sid") or next(iter(_SESSIONS), "")
-    _queue_event(
-        sid,
-        {
-            "type": "status",
-            "msg": msg,
-            "detail": {
-                "start": [start_vx, start_vy],
-                "end": [end_vx, end_vy]
-            },
-            "ts": int(time.time() * 1000),
-        },
-    )
+    _queue_event(sid, _status_event(msg, detail={"start": [start_vx, start_vy], "end": [end_vx, end_vy]}))
     return _ok(message=msg)
 
 
+_BATCH_MAX_OPS = 20
+_BATCH_OPS = {
+    "navigate": None,
+    "dom": lambda drv, op: Tools.get_dom_snapshot(drv, max_bytes=int(op.get("max_bytes") or 200_000)),
+    "click": lambda drv, op: Tools.click(drv, str(op.get("selector") or "")),
+    "type": lambda drv, op: Tools.input(drv, str(op.get("selector") or ""), str(op.get("text") or "")),
+    "scroll": lambda drv, op: Tools.scroll(drv, int(op.get("amount", 600))),
+}
+
+
+def _run_batch_op(op: dict) -> dict:
+    """Run one batch op on its own pooled driver, loading ``url`` first when given."""
+    name = str(op.get("op") or "").strip().lower()
+    url = str(op.get("url") or "").strip()
+    if name not in _BATCH_OPS:
+        return {"op": name, "ok": False, "result": f"Error: unknown op {name!r}"}
+    if name == "navigate" and not url:
+        return {"op": name, "ok": False, "result": "Error: missing url"}
+    try:
+        # Take the browser before the slot, so a batch waiting on the pool holds no slots.
+        with _POOL.checkout(_POOL_WAIT_S) as drv, _slot():
+            result = Tools.navigate(drv, url) if url else ""
+            runner = _BATCH_OPS[name]
+            if runner is not None and _result_ok(result):
+                result = runner(drv, op)
+    except Exception as exc:
+        log_message(f"[batch] {name} failed: {exc}", "WARNING")
+        return {"op": name, "ok": False, "result": f"Error: {exc}"}
+    return {"op": name, "ok": bool(result) and _result_ok(result), "result": result}
+
+
+@app.post("/batch")
+def batch():
+    data = _json_body(request)
+    ops = data.get("ops")
+    if not isinstance(ops, list) or not ops:
+        return _error("missing ops", 400)
+    if len(ops) > _BATCH_MAX_OPS:
+        return _error(f"too many ops (max {_BATCH_MAX_OPS})", 400)
+    if not all(isinstance(op, dict) for op in ops):
+        return _error("invalid ops", 400)
+    # The request itself already paid one token in _prepare_request.
+    if not _take_tokens(g.client_ip, len(ops) - 1):
+        return _rate_limited()
+    try:
+        workers = int(data.get("max_concurrency") or MAX_CONCURRENCY)
+    except (TypeError, ValueError):
+        return _error("invalid max_concurrency", 400)
+    workers = max(1, min(workers, MAX_CONCURRENCY, len(ops)))
+    results: list = [None] * len(ops)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scrape-batch") as pool:
+        futures = {pool.submit(_run_batch_op, op): idx for idx, op in enumerate(ops)}
+        for fut in as_completed(futures):
+            results[futures[fut]] = fut.result()
+    return _ok(results=results)
+
+
+_DOM_CHUNK_CHARS = 64 * 1024
+
+
+def _dom_json_chunks(html: str):
+    # Same document as _ok(dom=..., length=...), escaped and sent 64 KiB at a time.
+    yield b'{"ok":true,"dom":"'
+    for start in range(0, len(html), _DOM_CHUNK_CHARS):
+        yield _json_bytes(html[start:start + _DOM_CHUNK_CHARS])[1:-1]
+    yield b'","length":%d}' % len(html)
+
+
+_HTTP = requests.Session()
+# The session is shared by every caller for its connection pool only; refusing all cookies
+# keeps one client's upstream Set-Cookie from riding along on another client's fetch.
+_HTTP.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+_HTTP.mount("http://", HTTPAdapter(pool_connections=MAX_CONCURRENCY * 4, pool_maxsize=MAX_CONCURRENCY * 4))
+_HTTP.mount("https://", HTTPAdapter(pool_connections=MAX_CONCURRENCY * 4, pool_maxsize=MAX_CONCURRENCY * 4))
+_FETCH_USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+_FETCH_MAX_BYTES = 10 * 1024 * 1024
+
+
+@app.post("/fetch_html")
+def fetch_html():
+    data = _json_body(request)
+    url = (data.get("url") or "").strip()
+    if not url:
+        return _error("missing url", 400)
+    if not url.lower().startswith(("http://", "https://")):
+        return _error("url must be http(s)", 400)
+    try:
+        timeout = min(60.0, max(1.0, float(data.get("timeout") or 15.0)))
+    except (TypeError, ValueError):
+        return _error("invalid timeout", 400)
+    # Plain HTTP needs no browser, so no concurrency slot is taken here.
+    try:
+        with _HTTP.get(url, timeout=timeout, headers={"User-Agent": _FETCH_USER_AGENT}, stream=True) as upstream:
+            body = upstream.raw.read(_FETCH_MAX_BYTES + 1, decode_content=True)
+            status = upstream.status_code
+            final_url = upstream.url
+            content_type = upstream.headers.get("Content-Type") or "text/html"
+    except requests.RequestException as exc:
+        return _error(f"fetch failed: {exc}", 502)
+    headers = {"X-Upstream-Status": str(status), "X-Final-Url": final_url}
+    if len(body) > _FETCH_MAX_BYTES:
+        body = body[:_FETCH_MAX_BYTES]
+        headers["X-Body-Truncated"] = "1"
+    headers["X-Body-Bytes"] = str(len(body))
+    return _encoded_response(body, content_type, headers)
+
+
 @app.get("/dom")
 def dom_snapshot():
-    if not _auth_ok(request):
-        return _error("unauthorized", 401)
-    html = Tools.get_dom_snapshot(max_chars=200_000)
+    sid = g.sid
+    with _slot(), _Driving(g.session) as drv:
+        html = Tools.get_dom_snapshot(drv, max_bytes=200_000)
     if not html:
         return _error("no dom (browser closed?)", 409)
-    sid = request.args.get("sid") or next(iter(_SESSIONS), "")
-    _queue_event(sid, {"type": "dom", "chars": len(html), "ts": int(time.time() * 1000)})
-    return _ok(dom=html, length=len(html))
+    _queue_event(sid, {"type": "dom", "chars": len(html), "ts": _ts_ms()})
+    if request.args.get("format") == "html":
+        return _encoded_response(html.encode("utf-8"), "text/html; charset=utf-8", {"X-Dom-Chars": str(len(html))})
+    if request.accept_encodings["gzip"]:
+        body = _json_bytes({"ok": True, "dom": html, "length": len(html)})
+        return _encoded_response(body, "application/json")
+    return Response(_dom_json_chunks(html), mimetype="application/json")
 
 
 def _record_frame_meta(sid: str, fname: str, width: int, height: int) -> None:
@@ -1169,31 +1939,39 @@ def _record_frame_meta(sid: str, fname: str, width: int, height: int) -> None:
         meta = _SESSIONS.get(sid)
         if not meta:
             return
-        frames = meta.setdefault("frames", {})
-        frames[fname] = {"ts": int(time.time() * 1000), "width": width, "height": height}
+        meta.frames[fname] = FrameMeta(_ts_ms(), width, height)
+
+
+_PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+# next() on itertools.count is atomic under the GIL; the random suffix keeps names
+# unguessable and distinct across restarts.
+_FRAME_COUNTER = itertools.count()
+
+
+def _png_size(head: bytes) -> Tuple[int, int]:
+    """Width/height from the IHDR chunk that opens every PNG; ``(0, 0)`` if not a PNG."""
+    if len(head) < 24 or head[:8] != _PNG_MAGIC or head[12:16] != b"IHDR":
+        return 0, 0
+    return struct.unpack(">II", head[16:24])
 
 
 @app.get("/screenshot")
 def screenshot():
-    if not _auth_ok(request):
-        return _error("unauthorized", 401)
-    sid = request.args.get("sid") or next(iter(_SESSIONS), "")
-    fname = f"{uuid.uuid4().hex}.png"
-    fpath = OUT_DIR / fname
-    with _slot():
-        msg = Tools.screenshot(str(fpath))
-    if not _result_ok(msg):
-        return _error(msg, 500)
-    try:
-        with Image.open(fpath) as im:
-            width, height = im.size
-    except Exception:
-        width = height = 0
-    try:
-        raw_bytes = fpath.read_bytes()
-        b64_data = base64.b64encode(raw_bytes).decode("ascii")
-    except Exception:
-        b64_data = ""
+    sid = g.sid
+    with _slot(), _Driving(g.session) as drv:
+        png = Tools.screenshot(drv)
+    if not png:
+        return _error("browser not open", 409)
+    width, height = _png_size(png)
+    if request.args.get("inline") in ("1", "true"):
+        return Response(
+            png,
+            mimetype="image/png",
+            headers={"X-Frame-Width": str(width), "X-Frame-Height": str(height)},
+        )
+    fname = f"{next(_FRAME_COUNTER):08x}_{secrets.token_hex(4)}.png"
+    _submit_frame_write(fname, png)
+    b64_data = base64.b64encode(png).decode("ascii")
     rel_path = f"/frames/{fname}"
     _record_frame_meta(sid, fname, width, height)
     _queue_event(
@@ -1205,7 +1983,7 @@ def screenshot():
             "height": height,
             "mime": "image/png",
             "b64": b64_data,
-            "ts": int(time.time() * 1000),
+            "ts": _ts_ms(),
         },
     )
     return _ok(file=rel_path, width=width, height=height, mime="image/png", b64=b64_data)
@@ -1213,41 +1991,95 @@ def screenshot():
 
 @app.get("/frames/<path:filename>")
 def frames(filename):
-    if not _auth_ok(request):
-        return _error("unauthorized", 401)
-    return send_from_directory(OUT_DIR, filename, as_attachment=False, cache_timeout=0)
+    # Frame names are never reused, so the name alone identifies the content.
+    etag = hashlib.blake2b(filename.encode("utf-8"), digest_size=8).hexdigest()
+    if etag in request.if_none_match:
+        resp = Response(status=304)
+        resp.set_etag(etag)
+    else:
+        # The frame may have been announced before its background write finished.
+        _await_frame_write(filename)
+        if not XACCEL_PREFIX:
+            resp = send_from_directory(OUT_DIR, filename, as_attachment=False, etag=etag)
+        # Frames live flat in OUT_DIR; anything path-like never names one.
+        elif "/" in filename or "\\" in filename or filename.startswith("."):
+            return _error("not found", 404)
+        else:
+            resp = Response(b"", mimetype="image/png", headers={"X-Accel-Redirect": XACCEL_PREFIX + filename})
+            resp.set_etag(etag)
+    resp.headers["Cache-Control"] = f"private, max-age={FILE_TTL_S}"
+    return resp
+
+
+_SSE_FRAME_KEYS = frozenset({"type", "file", "width", "height", "mime", "b64", "ts"})
+_SSE_FRAME_PREFIX = b'data: {"type":"frame","file":'
+_SSE_KEEPALIVE = b":\n\n"
+_SSE_COALESCE_MAX = 64
+
+
+def _sse_message(payload: dict) -> bytes:
+    if payload.get("type") == "frame" and payload.keys() == _SSE_FRAME_KEYS:
+        # Frame events are dominated by the base64 body, which never needs JSON escaping.
+        return b"".join((
+            _SSE_FRAME_PREFIX,
+            _json_bytes(payload["file"]),
+            b',"width":%d,"height":%d,"mime":' % (payload["width"], payload["height"]),
+            _json_bytes(payload["mime"]),
+            b',"b64":"',
+            payload["b64"].encode("ascii"),
+            b'","ts":%d}\n\n' % payload["ts"],
+        ))
+    return b"data: " + _json_bytes(payload) + b"\n\n"
 
 
 def _sse_iter(sid: str):
-    q = _ensure_session(sid)
+    buf = _ensure_session(sid)
     keepalive_deadline = time.time() + FRAME_KEEPALIVE_S
     try:
         while True:
-            try:
-                payload = q.get(timeout=5.0)
+            with buf.cond:
+                if not buf.dq:
+                    buf.cond.wait(timeout=5.0)
+                batch = list(buf.dq)
+                buf.dq.clear()
+                if batch and SSE_COALESCE_MS:
+                    # Give a burst (frame + status + dom) a moment to land so it goes out in one write.
+                    flush_at = time.monotonic() + SSE_COALESCE_MS / 1000.0
+                    while len(batch) < _SSE_COALESCE_MAX:
+                        remaining = flush_at - time.monotonic()
+                        if remaining <= 0 or not buf.cond.wait(timeout=remaining):
+                            break
+                        batch.extend(buf.dq)
+                        buf.dq.clear()
+            if batch:
                 keepalive_deadline = time.time() + FRAME_KEEPALIVE_S
-                data = json.dumps(payload, separators=(",", ":"))
-                yield f"data: {data}\n\n"
-            except Empty:
-                now = time.time()
-                if now >= keepalive_deadline:
-                    keepalive_deadline = now + FRAME_KEEPALIVE_S
-                    yield ":\n\n"
-            except GeneratorExit:
-                break
+                yield b"".join(batch)
+                continue
+            now = time.time()
+            if now >= keepalive_deadline:
+                keepalive_deadline = now + FRAME_KEEPALIVE_S
+                yield _SSE_KEEPALIVE
     finally:
         _touch_session(sid)
 
 
+_SSE_STREAMS = threading.BoundedSemaphore(MAX_SSE_STREAMS)
+
+
 @app.get("/events")
 def events():
-    if not _auth_ok(request):
-        return _error("unauthorized", 401)
     sid = request.args.get("sid") or ""
     if not sid:
         return _error("missing sid", 400)
+    if not _SSE_STREAMS.acquire(blocking=False):
+        return _error("too many event streams", 503)
     _touch_session(sid)
-    return Response(_sse_iter(sid), mimetype="text/event-stream")
+    resp = Response(_sse_iter(sid), mimetype="text/event-stream", direct_passthrough=True)
+    # Runs when the server closes the response, even if the stream never started.
+    resp.call_on_close(_SSE_STREAMS.release)
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.headers["X-Accel-Buffering"] = "no"
+    return resp
 
 
 @app.errorhandler(TimeoutError)
@@ -1257,17 +2089,31 @@ def _timeout_handler(exc):
 
 @app.errorhandler(Exception)
 def _unhandled(exc):
+    if isinstance(exc, HTTPException):
+        return _error(exc.name.lower(), exc.code or 500)
     print(f"[error] {exc}", file=sys.stderr)
     return _error("internal error", 500)
 
 
 @app.after_request
 def _default_headers(resp):
-    resp.headers.setdefault("Cache-Control", "no-store, max-age=0")
-    resp.headers.setdefault("Access-Control-Allow-Headers", "Content-Type, Authorization, X-API-Key")
+    resp.headers.setdefault("Cache-Control", _CACHE_CTRL)
+    resp.headers.setdefault("Access-Control-Allow-Headers", _ACAH)
     return resp
 
 
 if __name__ == "__main__":
     print(f"[service] starting web_scrape on {BIND}:{PORT}", file=sys.stderr)
-    app.run(host=BIND, port=PORT, debug=False, threaded=True)
+    try:
+        from waitress import serve
+    except ImportError:  # installs bootstrapped before waitress was added
+        app.run(host=BIND, port=PORT, debug=False, threaded=True)
+    else:
+        serve(
+            app,
+            host=BIND,
+            port=PORT,
+            threads=HTTP_THREADS + MAX_SSE_STREAMS,
+            connection_limit=1024,
+            channel_timeout=FRAME_KEEPALIVE_S * 2,
+        )